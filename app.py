@@ -1,3 +1,4 @@
+import pandas as pd
 import streamlit as st
 from src.data import load_data
 from src.filters import sidebar_filters
@@ -10,6 +11,10 @@ from src.charts import (
     trending_genres_board,
 )
 
+# Copy-on-Write (padrão a partir do pandas 3.0): recortes compartilham memória até haver escrita
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 # Configuração da página com ícone da marca
 st.set_page_config(page_title="Games Analytics Dashboard", page_icon="logo.jpeg", layout="wide")
 
@@ -19,7 +24,9 @@ def _brand_header():
 
 _brand_header()
 
-@st.cache_data(show_spinner=False)
+# cache_resource: o mesmo DataFrame (somente leitura) é compartilhado entre reruns e sessões, sem cópia.
+# A identidade estável também mantém válidos os caches de filtros/gráficos chaveados pelo frame.
+@st.cache_resource(show_spinner=False, ttl=600)
 def get_data():
     return load_data()
 
@@ -70,6 +77,8 @@ view = st.sidebar.radio(
     help="Renderize apenas uma seção por vez para deixar a página mais leve.",
 )
 
+# Cada seção roda como fragmento: interações internas reexecutam só o próprio fragmento
+@st.fragment
 def _safe_draw(fn, title: str | None = None):
     try:
         if title:
@@ -79,6 +88,7 @@ def _safe_draw(fn, title: str | None = None):
         st.warning(f"Não foi possível renderizar um gráfico: {e}")
 
 # Renderiza KPIs no topo de cada seção de gráficos
+@st.fragment
 def _kpis_top():
     try:
         kpi_cards(df, filters)
@@ -2,11 +2,23 @@ import altair as alt
 import streamlit as st
 import pandas as pd
 import numpy as np
+import re
 from datetime import datetime
 
+from src.filters import freeze_filters, _frame_token
+
 # Limitar dados embutidos nos gráficos para evitar payloads gigantes (mais leve em produção)
 alt.data_transformers.enable("default", max_rows=15_000)
 
+# Sentinela para ano ausente nos arrays de filtro (menor int16: nunca cai numa janela de anos)
+_YEAR_NA = np.iinfo(np.int16).min
+
+# Primeiro grupo de 4 dígitos (ano) no título, para o último recurso de releases_by_year_chart
+_YEAR_RE = re.compile(r"(\d{4})")
+
+# Primeiro item de uma lista separada por vírgulas, sem espaços nas pontas (publisher principal)
+_FIRST_ITEM_RE = re.compile(r"^\s*([^,]*?)\s*(?:,|$)")
+
 # -----------------------------
 # Paleta de cores do dashboard (inspirada no logo)
 # Laranja → Coral → Magenta → Roxo
@@ -33,11 +45,8 @@ BRAND_PRIMARY = "#E43D7A"
 BRAND_SECONDARY = "#6B1E78"
 
 # Limiares de desempenho (ajuste conforme necessário para o deploy)
-MAX_POINTS_SCATTER = 8_000           # máximo de pontos no scatter
+MAX_POINTS_SCATTER = 8_000           # acima disso, usar heatmap em vez de scatter
 TOOLTIP_SWITCH = 2_000               # acima disso, usar tooltips mínimos
-TOOLTIP_DISABLE = 10_000             # acima disso, desativar tooltips
-HEATMAP_THRESHOLD = 30_000           # acima disso, usar heatmap em vez de scatter
-BOX_AGG_THRESHOLD = 50_000           # acima disso, pré-agregar quantis para boxplot
 
 
 def _ensure_sentiment_ratio(df: pd.DataFrame) -> pd.Series:
@@ -50,67 +59,191 @@ def _ensure_sentiment_ratio(df: pd.DataFrame) -> pd.Series:
             return pd.to_numeric(df["sentiment_ratio"], errors="coerce")
         except Exception:
             pass
-    pos = pd.to_numeric(df.get("Positive", pd.Series(index=df.index, dtype=float)), errors="coerce").fillna(0)
-    neg = pd.to_numeric(df.get("Negative", pd.Series(index=df.index, dtype=float)), errors="coerce").fillna(0)
+    # Checagem explícita em vez de df.get(col, Series default): não aloca uma Series vazia a cada chamada
+    if "Positive" not in df.columns and "Negative" not in df.columns:
+        return pd.Series(np.nan, index=df.index, dtype=float)
+    pos = pd.to_numeric(df["Positive"], errors="coerce").fillna(0) if "Positive" in df.columns else 0.0
+    neg = pd.to_numeric(df["Negative"], errors="coerce").fillna(0) if "Negative" in df.columns else 0.0
     denom = pos + neg
-    ratio = pos.div(denom).where(denom > 0)
+    ratio = (pos / denom).where(denom > 0)
     return ratio.astype(float)
 
 
+# Campos do dicionário de filtros, na ordem usada pelas chaves de cache
+_FILTER_FIELDS = ("years", "price", "platforms", "genres", "min_acceptance_pct")
+
+
+def _filters_key(f: dict) -> tuple:
+    """Congela o dicionário de filtros em uma tupla hashable, usada como chave de cache.
+    Plataformas e gêneros funcionam como conjuntos (OR / isin), então são ordenados:
+    a ordem de seleção no multiselect não gera uma nova entrada de cache.
+    """
+    years, price, platforms, genres, min_pct = (freeze_filters(f.get(k)) for k in _FILTER_FIELDS)
+    return years, price, tuple(sorted(platforms or ())), tuple(sorted(genres or ())), min_pct
+
+
+@st.cache_resource(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _frame_token})
+def _filter_arrays(df) -> dict:
+    """Colunas usadas pelos filtros materializadas uma única vez como arrays NumPy tipados.
+    Em cache_resource (sem cópia): cada nova combinação de filtros só faz comparações vetorizadas.
+    """
+    arrays = {}
+    if "release_year" in df.columns:
+        # int16 com sentinela para NaN: comparação direta, sem fillna
+        y = (
+            pd.to_numeric(df["release_year"], errors="coerce")
+            .clip(_YEAR_NA + 1, np.iinfo(np.int16).max)
+            .to_numpy(dtype="int16", na_value=_YEAR_NA)
+        )
+        arrays["release_year"] = y
+        # Carregador ordena por ano (NaN primeiro): permite recortar a janela com searchsorted
+        arrays["year_sorted"] = bool(df.attrs.get("year_sorted")) and bool(np.all(y[:-1] <= y[1:]))
+    if "Price" in df.columns:
+        arrays["Price"] = pd.to_numeric(df["Price"], errors="coerce").to_numpy(dtype="float32", na_value=np.nan)
+    # Plataformas empacotadas em um byte por linha (bit i = plataforma i) + índice nome -> bit
+    plat_cols = [c for c in ("Windows", "Mac", "Linux") if c in df.columns]
+    plat_bits = np.zeros(len(df), dtype=np.uint8)
+    for i, c in enumerate(plat_cols):
+        flags = df[c].to_numpy() if pd.api.types.is_bool_dtype(df[c].dtype) else df[c].fillna(False).to_numpy(dtype=bool)
+        plat_bits |= flags.astype(np.uint8) << i
+    arrays["platform_bits"] = plat_bits
+    arrays["platform_index"] = {c: i for i, c in enumerate(plat_cols)}
+    # Gênero sempre como códigos inteiros (categórico do carregador ou factorize uma única vez)
+    if "primary_genre" in df.columns:
+        genre = df["primary_genre"]
+        if isinstance(genre.dtype, pd.CategoricalDtype):
+            arrays["genre_codes"] = genre.cat.codes.to_numpy()
+            arrays["genre_categories"] = genre.cat.categories
+        else:
+            codes, uniques = pd.factorize(genre)
+            arrays["genre_codes"] = codes
+            arrays["genre_categories"] = pd.Index(uniques)
+    try:
+        if "acceptance_pct" in df.columns:
+            arrays["acceptance_pct"] = df["acceptance_pct"].to_numpy(dtype="float32", na_value=np.nan)
+        else:
+            arrays["acceptance_pct"] = _ensure_sentiment_ratio(df).to_numpy(dtype="float64", na_value=np.nan) * 100.0
+    except Exception:
+        arrays["acceptance_pct"] = None
+    return arrays
+
+
+@st.cache_data(show_spinner=False, max_entries=64, hash_funcs={pd.DataFrame: _frame_token})
+def _compute_mask(df, years, price, platforms, genres, min_pct) -> np.ndarray:
+    """Máscara booleana (NumPy) com todos os filtros combinados in-place (&=) em um único array.
+    Fica em cache por (DataFrame, filtros): gráficos e KPIs do mesmo rerun reaproveitam o resultado.
+    """
+    arrays = _filter_arrays(df)
+    n = len(df)
+    # Linhas candidatas: com o ano ordenado, a janela de anos é um intervalo contíguo [i, j)
+    sl = slice(0, n)
+    part = np.ones(n, dtype=bool)
+    # Ano (NaN = sentinela _YEAR_NA)
+    if "release_year" in arrays and years is not None:
+        lo, hi = years
+        y = arrays["release_year"]
+        if arrays["year_sorted"]:
+            sl = slice(int(np.searchsorted(y, lo, "left")), int(np.searchsorted(y, hi, "right")))
+            part = np.ones(sl.stop - sl.start, dtype=bool)
+        else:
+            part &= y >= lo
+            part &= y <= hi
+    # Preço (mantém NaN)
+    if "Price" in arrays and price is not None:
+        lo, hi = price
+        p = arrays["Price"][sl]
+        # NaN falha nas duas comparações: NOT(p < lo OR p > hi) mantém preço ausente
+        out = p < lo
+        out |= p > hi
+        part &= ~out
+    # Plataformas: manter linhas com QUALQUER plataforma marcada (OR)
+    sel = [arrays["platform_index"][p] for p in platforms or () if p in arrays["platform_index"]]
+    if sel:
+        # OR das plataformas = teste de bits contra a máscara pedida, numa passada de 1 byte/linha
+        wanted = np.uint8(sum(1 << i for i in sel))
+        part &= (arrays["platform_bits"][sl] & wanted) != 0
+    # Gêneros principais (comparação pelos códigos inteiros quando categórico)
+    if genres and "genre_codes" in arrays:
+        wanted = arrays["genre_categories"].get_indexer(list(genres))
+        part &= np.isin(arrays["genre_codes"][sl], wanted[wanted >= 0])
+    # Aceitação mínima (%) baseada em Positive/Negative
+    acc = arrays["acceptance_pct"]
+    if min_pct is not None and acc is not None:
+        acc = acc[sl]
+        # Só filtra se houver alguma aceitação válida entre as linhas já selecionadas
+        if (~np.isnan(acc[part])).any():
+            part &= np.where(np.isnan(acc), -1.0, acc) >= float(min_pct)
+    mask = np.zeros(n, dtype=bool)
+    mask[sl] = part
+    return mask
+
+
+@st.cache_resource(show_spinner=False, ttl=600, max_entries=8, hash_funcs={pd.DataFrame: _frame_token})
+def _filtered_frame(df, filters_key) -> pd.DataFrame:
+    """Recorte filtrado compartilhado por KPIs e gráficos com os mesmos filtros.
+    cache_resource devolve o mesmo objeto, sem cópia; com Copy-on-Write os consumidores não o alteram.
+    """
+    mask = _compute_mask(df, *filters_key)
+    # Um único recorte no final (sem df.copy() prévio); acceptance_pct já vem do carregador
+    q = df.iloc[np.flatnonzero(mask)]
+    if "acceptance_pct" not in q.columns:
+        try:
+            q = q.assign(acceptance_pct=_ensure_sentiment_ratio(q) * 100.0)
+        except Exception:
+            pass
+    return q
+
+
 def _apply_filters(df, f):
-    q = df.copy()
-    # Ano (aplica só se fornecido)
     # Fallback: se o filtro de ano foi definido mas a coluna não existe, tenta derivar
-    if f.get("years") is not None and "release_year" not in q.columns:
+    if f.get("years") is not None and "release_year" not in df.columns:
         try:
             from src.data import _derive_release_year
-            q = _derive_release_year(q)
+            # Cópia rasa basta: _derive_release_year só atribui colunas inteiras (não escreve nos dados originais)
+            df = _derive_release_year(df.copy(deep=False))
         except Exception:
             pass
-    if "release_year" in q.columns and f.get("years") is not None:
-        lo, hi = f["years"]
-        q = q[(q["release_year"].fillna(0) >= lo) & (q["release_year"].fillna(0) <= hi)]
-    # Preço (mantém NaN)
-    if "Price" in q.columns and f.get("price") is not None:
-        lo, hi = f["price"]
-        q = q[q["Price"].isna() | q["Price"].between(lo, hi)]
-    # Plataformas: manter linhas com QUALQUER plataforma marcada (OR)
-    sel = [p for p in f.get("platforms", []) if p in q.columns]
-    if sel:
-        q = q[q[sel].any(axis=1)]
-    # Gêneros principais
-    if f.get("genres"):
-        if "primary_genre" in q.columns:
-            q = q[q["primary_genre"].isin(f["genres"])]
-    # Aceitação mínima (%) baseada em Positive/Negative
-    try:
-        ratio = _ensure_sentiment_ratio(q)
-        q = q.assign(acceptance_pct=ratio * 100.0)
-        min_pct = f.get("min_acceptance_pct")
-        if min_pct is not None and q["acceptance_pct"].notna().any():
-            q = q[(q["acceptance_pct"].fillna(-1) >= float(min_pct))]
-    except Exception:
-        # Se falhar, segue sem filtrar por aceitação
-        pass
-    return q
+    return _filtered_frame(df, _filters_key(f))
+
+
+def _nan_reduce(values: np.ndarray, fn) -> float:
+    """Aplica uma redução NumPy ignorando NaN; retorna NaN se não sobrar nenhum valor."""
+    v = values[~np.isnan(values)]
+    return float(fn(v)) if v.size else np.nan
+
+
+def _kpi_values(q: pd.DataFrame) -> dict:
+    """Calcula todas as métricas dos KPIs de uma vez, direto sobre arrays NumPy."""
+    def col(name):
+        if name not in q.columns:
+            return np.empty(0)
+        return pd.to_numeric(q[name], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+    return {
+        "n": len(q),
+        "free_pct": _nan_reduce(col("is_free"), np.mean) * 100 if len(q) else 0.0,
+        "price_median": _nan_reduce(col("Price"), np.median),
+        "acceptance_mean": _nan_reduce(col("acceptance_pct"), np.mean),
+        "owners_median": _nan_reduce(col("owners_mid"), np.median),
+    }
 
 
 def kpi_cards(df, f):
-    q = _apply_filters(df, f)
+    k = _kpi_values(_apply_filters(df, f))
     col1, col2, col3, col4, col5 = st.columns(5)
     with col1:
-        st.metric("Jogos", f"{len(q):,}")
+        st.metric("Jogos", f"{k['n']:,}")
     with col2:
-        val = (q.get("is_free", pd.Series([False]*len(q))).astype(float).mean()*100) if len(q) else 0
-        st.metric("% Free-to-Play", f"{val:.1f}%")
+        val = k["free_pct"]
+        st.metric("% Free-to-Play", f"{0 if pd.isna(val) else val:.1f}%")
     with col3:
-        med = q.get("Price", pd.Series(dtype=float)).median() if len(q) else 0
+        med = k["price_median"]
         st.metric("Preço mediano", f"${0 if pd.isna(med) else med:.2f}")
     with col4:
-        mean_acc = q.get("acceptance_pct", pd.Series(dtype=float)).mean()
+        mean_acc = k["acceptance_mean"]
         st.metric("Aceitação média (%)", f"{0 if pd.isna(mean_acc) else mean_acc:.1f}%")
     with col5:
-        med_own = q.get("owners_mid", pd.Series(dtype=float)).median()
+        med_own = k["owners_median"]
         st.metric("Owners (mediana)", f"{0 if pd.isna(med_own) else med_own:,.0f}")
 
 
@@ -131,7 +264,7 @@ def releases_by_year_chart(df, f):
     if years_series is None or pd.isna(years_series).all():
         try:
             from src.data import _derive_release_year
-            q2 = _derive_release_year(q.copy())
+            q2 = _derive_release_year(q.copy(deep=False))
             cand = pd.to_numeric(q2.get("release_year"), errors="coerce")
             if cand.notna().any():
                 years_series = cand
@@ -142,19 +275,10 @@ def releases_by_year_chart(df, f):
     if years_series is None or pd.isna(years_series).all():
         name_col = "Name" if "Name" in q.columns else ("name" if "name" in q.columns else None)
         if name_col is not None:
-            raw = q[name_col].astype(str).str.strip()
-            try:
-                dt = pd.to_datetime(raw, errors="coerce", format="mixed", cache=True)
-            except TypeError:
-                dt = pd.to_datetime(raw, errors="coerce")
-            cand = dt.dt.year.astype("float")
-            mask_na = cand.isna()
-            if mask_na.any():
-                import re as _re
-                cand.loc[mask_na] = raw[mask_na].apply(
-                    lambda s: int(_re.search(r"(\d{4})", s).group(1)) if _re.search(r"(\d{4})", s) else float("nan")
-                )
-            years_series = cand
+            # Só precisamos do ano: uma regex vetorizada (str.extract) em vez de to_datetime(format="mixed")
+            years_series = pd.to_numeric(
+                q[name_col].astype(str).str.extract(_YEAR_RE, expand=False), errors="coerce"
+            )
 
     # Se ainda assim não houver anos válidos, aborta
     if years_series is None or pd.isna(years_series).all():
@@ -171,14 +295,11 @@ def releases_by_year_chart(df, f):
         st.info("Não há anos plausíveis para exibir após a limpeza dos dados.")
         return
 
-    # Agregação: contagem de lançamentos por ano
-    year_stats = (
-        pd.DataFrame({"year": years_series})
-        .dropna()
-        .groupby("year", as_index=False)
-        .agg(releases=("year", "size"))
-        .sort_values("year")
-    )
+    # Agregação: contagem de lançamentos por ano com np.bincount (anos já limitados a [1970, ano atual])
+    years = years_series.dropna().to_numpy(dtype="int64")
+    counts = np.bincount(years - 1970)
+    present = np.flatnonzero(counts)
+    year_stats = pd.DataFrame({"year": present + 1970, "releases": counts[present]})
 
     chart = (
         alt.Chart(year_stats)
@@ -191,31 +312,33 @@ def releases_by_year_chart(df, f):
     st.altair_chart(chart, width="stretch")
 
 
+def _scatter_rows(q: pd.DataFrame) -> pd.DataFrame:
+    """Linhas plotáveis (owners_mid > 0 e preço presente) com uma única máscara NumPy e um único recorte."""
+    # NaN falha em "> 0": owners ausentes e zeros/negativos implausíveis saem juntos
+    keep = q["owners_mid"].to_numpy(dtype="float64", na_value=np.nan) > 0
+    if "Price" in q.columns:
+        keep &= ~pd.isna(q["Price"].to_numpy())
+    return q.iloc[np.flatnonzero(keep)]
+
+
 def price_vs_owners_scatter(df, f):
     q = _apply_filters(df, f)
     # Verificações e limpeza de dados essenciais
     if "owners_mid" not in q.columns:
         st.info("Dataset sem coluna 'Estimated owners' → 'owners_mid' não disponível.")
         return
-    q = q.dropna(subset=["owners_mid"]).copy()
-    if "Price" in q.columns:
-        q = q[q["Price"].notna()]
-    # Evitar zeros/negativos implausíveis
-    q = q[q["owners_mid"] > 0]
+    q = _scatter_rows(q)
 
     # Garantir coluna de gênero principal
     if "primary_genre" not in q.columns:
-        q["primary_genre"] = pd.Series(["Unknown"] * len(q), index=q.index)
+        q = q.assign(primary_genre="Unknown")
 
     # Se vazio, tenta relaxar filtros (aceitação e gêneros) para garantir exibição
     if q.empty:
         f2 = dict(f)
         f2["min_acceptance_pct"] = 0
         f2["genres"] = []
-        q2 = _apply_filters(df, f2).dropna(subset=["owners_mid"]).copy()
-        if "Price" in q2.columns:
-            q2 = q2[q2["Price"].notna()]
-        q2 = q2[q2["owners_mid"] > 0]
+        q2 = _scatter_rows(_apply_filters(df, f2))
         if q2.empty:
             st.info("Sem dados com os filtros atuais (mesmo após relaxar aceitação e gêneros). Refine os filtros.")
             return
@@ -224,20 +347,29 @@ def price_vs_owners_scatter(df, f):
 
     total = len(q)
 
-    # Heatmap para casos extremos (reduz drasticamente o payload)
-    if total > HEATMAP_THRESHOLD:
+    # Acima do limite do scatter, heatmap agregado no servidor (sem amostragem: o payload fica em células)
+    if total > MAX_POINTS_SCATTER:
         st.caption("Muitos pontos selecionados — exibindo heatmap para melhor desempenho.")
-        bins_x = alt.Bin(maxbins=40)
-        bins_y = alt.Bin(maxbins=40)
+        # Grade 40x40 calculada no servidor: o navegador recebe só as células não vazias
+        counts, x_edges, y_edges = np.histogram2d(
+            q["Price"].to_numpy(dtype="float64"), q["owners_mid"].to_numpy(dtype="float64"), bins=40
+        )
+        ix, iy = np.nonzero(counts)
+        heat_df = pd.DataFrame({
+            "price_bin": x_edges[ix],
+            "price_bin_end": x_edges[ix + 1],
+            "owners_bin": y_edges[iy],
+            "owners_bin_end": y_edges[iy + 1],
+            "count": counts[ix, iy].astype("int64"),
+        })
         heat = (
-            alt.Chart(q)
-            .transform_bin("price_bin", "Price", bin=bins_x)
-            .transform_bin("owners_bin", "owners_mid", bin=bins_y)
-            .transform_aggregate(count="count()", groupby=["price_bin", "owners_bin"])
+            alt.Chart(heat_df)
             .mark_rect()
             .encode(
                 x=alt.X("price_bin:Q", title="Preço (USD)"),
+                x2="price_bin_end:Q",
                 y=alt.Y("owners_bin:Q", title="Owners (midpoint)"),
+                y2="owners_bin_end:Q",
                 color=alt.Color("count:Q", scale=alt.Scale(range=BRAND_SEQUENTIAL)),
                 tooltip=[alt.Tooltip("count:Q", title="Quantidade")],
             )
@@ -245,11 +377,6 @@ def price_vs_owners_scatter(df, f):
         st.altair_chart(heat, width="stretch")
         return
 
-    # Downsample para evitar payload excessivo no front-end
-    if total > MAX_POINTS_SCATTER:
-        q = q.sample(n=MAX_POINTS_SCATTER, random_state=42)
-        st.caption(f"Amostrando {MAX_POINTS_SCATTER:,} de {total:,} pontos para desempenho.")
-
     # Reduzir/Desligar tooltips conforme tamanho
     # Garante coluna de aceitação para tooltip
     if "acceptance_pct" not in q.columns:
@@ -257,13 +384,15 @@ def price_vs_owners_scatter(df, f):
     full_tooltips = [c for c in ["Name", "Price", "owners_mid", "primary_genre", "Publishers", "acceptance_pct"] if c in q.columns]
     minimal_tooltips = [c for c in ["Name", "Price", "owners_mid", "primary_genre"] if c in q.columns]
     n = len(q)
-    if n > TOOLTIP_DISABLE:
-        tooltips = []
-    elif n > TOOLTIP_SWITCH:
+    if n > TOOLTIP_SWITCH:
         tooltips = minimal_tooltips
     else:
         tooltips = full_tooltips
 
+    # Envia ao front-end apenas as colunas codificadas no gráfico (listas/textos extras inflam o payload)
+    encoded = ["Price", "owners_mid", "primary_genre", "Recommendations", *tooltips]
+    q = q[[c for c in dict.fromkeys(encoded) if c in q.columns]]
+
     chart = (
         alt.Chart(q)
         .mark_circle(opacity=0.6)
@@ -284,49 +413,124 @@ def price_vs_owners_scatter(df, f):
     st.altair_chart(chart, width="stretch")
 
 
+def _group_quantiles(keys: pd.Series, values: pd.Series, probs, whiskers: bool = False):
+    """Quantis por grupo com uma única ordenação em NumPy (em vez de groupby().quantile([...])).
+    Usa interpolação linear, como o pandas; valores NaN são ignorados.
+    Com whiskers=True (exige 0.25 e 0.75 em probs) também calcula os bigodes de Tukey, como o
+    mark_boxplot do Vega-Lite: colunas "lower"/"upper" com o ponto mais distante dentro de
+    q1 − 1,5·IQR e q3 + 1,5·IQR, e devolve (quantis, outliers) com os valores fora dessa faixa.
+    """
+    codes, uniques = pd.factorize(keys)
+    v = pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    ok = (codes >= 0) & ~np.isnan(v)
+    codes, v = codes[ok], v[ok]
+    # Ordena por (grupo, valor): cada grupo vira um bloco contíguo e ordenado
+    order = np.lexsort((v, codes))
+    v = v[order]
+    counts = np.bincount(codes, minlength=len(uniques))
+    present = np.flatnonzero(counts)
+    n = counts[present]
+    starts = (np.cumsum(counts) - counts)[present]
+    out = {}
+    for p in probs:
+        pos = p * (n - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, n - 1)
+        out[p] = v[starts + lo] + (pos - lo) * (v[starts + hi] - v[starts + lo])
+    index = pd.Index(np.asarray(uniques)[present], name=keys.name)
+    if not whiskers:
+        return pd.DataFrame(out, index=index)
+
+    # Grupo (posição em present) de cada valor ordenado
+    group = np.repeat(np.arange(len(present)), n)
+    iqr = out[0.75] - out[0.25]
+    lo_fence, hi_fence = out[0.25] - 1.5 * iqr, out[0.75] + 1.5 * iqr
+    inside = (v >= lo_fence[group]) & (v <= hi_fence[group])
+    # Blocos ordenados: min/max dos valores dentro das cercas via reduceat no início de cada grupo
+    stats = pd.DataFrame(out, index=index)
+    if len(present):
+        stats["lower"] = np.minimum.reduceat(np.where(inside, v, np.inf), starts)
+        stats["upper"] = np.maximum.reduceat(np.where(inside, v, -np.inf), starts)
+    else:
+        stats["lower"] = stats["upper"] = np.empty(0)
+    outliers = pd.DataFrame({keys.name: index.to_numpy()[group[~inside]], values.name: v[~inside]})
+    return stats, outliers
+
+
 def price_by_genre_boxplot(df, f):
     q = _apply_filters(df, f)
     if q.empty or "primary_genre" not in q.columns or "Price" not in q.columns:
         st.info("Sem dados suficientes para exibir boxplots por gênero.")
         return
-    top10 = q["primary_genre"].value_counts().head(10).index
-    q = q[q["primary_genre"].isin(top10)]
-
-    if len(q) > BOX_AGG_THRESHOLD:
-        # Pré-calcula quantis no servidor para reduzir dados enviados
-        qs = (
-            q.groupby("primary_genre", observed=True)["Price"]
-            .quantile([0.0, 0.25, 0.5, 0.75, 1.0])
-            .unstack()
-            .rename(columns={0.00: "min", 0.25: "q1", 0.50: "med", 0.75: "q3", 1.00: "max"})
-            .reset_index()
-        )
-        base = alt.Chart(qs).encode(x=alt.X("primary_genre:N", sort="-y", title="Gênero"))
-        iqr = base.mark_bar(color=BRAND_SECONDARY, opacity=0.7).encode(y="q1:Q", y2="q3:Q")
-        whisk = base.mark_rule(color=BRAND_SECONDARY).encode(y="min:Q", y2="max:Q")
-        med = base.mark_tick(color="white", size=20).encode(y="med:Q")
-        st.altair_chart(iqr + whisk + med, width="stretch")
-        st.caption("Boxplot com quantis pré-calculados para melhor desempenho.")
-        return
-
-    chart = alt.Chart(q).mark_boxplot().encode(
-        x=alt.X("primary_genre:N", sort="-y", title="Gênero"),
-        y=alt.Y("Price:Q", title="Preço"),
-        color=alt.Color("primary_genre:N", legend=None, scale=alt.Scale(range=BRAND_CATEGORICAL)),
+    # Top 10 gêneros por contagem: seleção parcial sobre os códigos inteiros (sem ordenar tudo)
+    genre = q["primary_genre"]
+    if isinstance(genre.dtype, pd.CategoricalDtype):
+        codes, n_codes = genre.cat.codes.to_numpy(), len(genre.cat.categories)
+    else:
+        codes, uniques = pd.factorize(genre)
+        n_codes = len(uniques)
+    counts = np.bincount(codes[codes >= 0], minlength=n_codes)
+    top10 = np.flatnonzero(counts)
+    if len(top10) > 10:
+        top10 = np.argpartition(-counts, 9)[:10]
+    q = q[np.isin(codes, top10)]
+
+    # Quantis e bigodes de Tukey (1,5·IQR) pré-calculados no servidor: o navegador recebe
+    # 10 linhas de estatísticas e só os pontos fora dos bigodes, não todos os jogos
+    qs, outliers = _group_quantiles(q["primary_genre"], q["Price"], [0.25, 0.5, 0.75], whiskers=True)
+    qs = qs.rename(columns={0.25: "q1", 0.50: "med", 0.75: "q3"}).reset_index()
+    outliers["primary_genre"] = outliers["primary_genre"].astype(str)
+    qs["primary_genre"] = qs["primary_genre"].astype(str)
+    color = alt.Color("primary_genre:N", legend=None, scale=alt.Scale(range=BRAND_CATEGORICAL))
+    x = alt.X("primary_genre:N", sort="-y", title="Gênero")
+    base = alt.Chart(qs).encode(x=x)
+    iqr = base.mark_bar(opacity=0.7).encode(y=alt.Y("q1:Q", title="Preço"), y2="q3:Q", color=color)
+    whisk = base.mark_rule(color=BRAND_SECONDARY).encode(y=alt.Y("lower:Q", title="Preço"), y2="upper:Q")
+    med = base.mark_tick(color="white", size=20).encode(y=alt.Y("med:Q", title="Preço"))
+    pts = alt.Chart(outliers).mark_point(size=20).encode(
+        x=x, y=alt.Y("Price:Q", title="Preço"), color=color,
     )
-    st.altair_chart(chart, width="stretch")
+    st.altair_chart(whisk + iqr + med + pts, width="stretch")
+    st.caption("Boxplot com quantis pré-calculados para melhor desempenho.")
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=32, hash_funcs={pd.DataFrame: _frame_token})
+def _top_publishers(df, filters_key, top_n=15):
+    """Soma de owners por publisher principal (top N) para um conjunto de filtros.
+    Em cache para não refazer a agregação ao alternar entre seções com os mesmos filtros.
+    """
+    mask = _compute_mask(df, *filters_key)
+    if not mask.any() or "Publishers" not in df.columns:
+        return None
+    pub = df.get("primary_publisher")
+    if pub is not None and isinstance(pub.dtype, pd.CategoricalDtype):
+        # Soma por código do publisher com np.bincount: uma passada, sem tabela hash do groupby
+        codes = pub.cat.codes.to_numpy()[mask]
+        owners = df["owners_mid"].to_numpy(dtype="float64", na_value=np.nan)[mask]
+        ok = codes >= 0
+        codes, owners = codes[ok], np.nan_to_num(owners[ok])
+        n_pubs = len(pub.cat.categories)
+        sums = np.bincount(codes, weights=owners, minlength=n_pubs)
+        observed = np.flatnonzero(np.bincount(codes, minlength=n_pubs))
+        if len(observed) > top_n:
+            observed = observed[np.argpartition(-sums[observed], top_n - 1)[:top_n]]
+        top = observed[np.argsort(-sums[observed], kind="stable")]
+        return pd.DataFrame({
+            "Publisher": pub.cat.categories[top].astype(str),
+            "owners_mid": sums[top],
+        })
+    q = df.iloc[np.flatnonzero(mask)]
+    # Uma única extração por regex em vez de split + [0] + strip encadeados
+    publisher = q["Publishers"].astype(str).str.extract(_FIRST_ITEM_RE, expand=False)
+    sums = q["owners_mid"].groupby(publisher.rename("Publisher"), sort=False).sum()
+    return sums.nlargest(top_n).reset_index()
 
 
 def top_publishers_bar(df, f):
-    q = _apply_filters(df, f)
-    if q.empty or "Publishers" not in q.columns:
+    pubs = _top_publishers(df, _filters_key(f))
+    if pubs is None:
         st.info("Sem dados de publishers suficientes.")
         return
-    pubs = (
-        q.assign(Publisher=q["Publishers"].astype(str).str.split(",").str[0].str.strip())
-         .groupby("Publisher", as_index=False)["owners_mid"].sum()
-         .sort_values("owners_mid", ascending=False).head(15)
-    )
     chart = alt.Chart(pubs).mark_bar(color=BRAND_SECONDARY).encode(
         x=alt.X("owners_mid:Q", title="Owners (soma)"),
         y=alt.Y("Publisher:N", sort="-x", title="Publisher"),
@@ -335,102 +539,92 @@ def top_publishers_bar(df, f):
     st.altair_chart(chart, width="stretch")
 
 
-def trending_genres_board(df: pd.DataFrame, f: dict, top_n: int = 7, window_years: int = 5):
-    """Exibe dois gráficos lado a lado destacando gêneros emergentes e em declínio.
-    A tendência é estimada pelo coeficiente angular (slope) da participação anual (share) do gênero
-    ao longo de uma janela recente de anos.
-
-    - emergentes: maiores slopes positivos (p.p. por ano)
-    - em declínio: menores slopes (negativos)
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=32, hash_funcs={pd.DataFrame: _frame_token})
+def _trend_slopes(df, filters_key, window_years=5):
+    """Slope da participação anual de cada gênero na janela recente de anos.
+    Retorna (df_slopes, ano_inicial, ano_final, aviso); em falta de dados, só o aviso vem preenchido.
+    A chave já vem sem gêneros: mudar a seleção de gêneros reaproveita o cache.
     """
-    # Aplicar filtros, mas ignorar pré-seleção de gêneros para não enviesar a tendência
-    f2 = dict(f)
-    f2["genres"] = []
-    q = _apply_filters(df, f2)
+    q = _apply_filters(df, dict(zip(_FILTER_FIELDS, filters_key)))
 
     # Garantir ano e gênero disponíveis
     if ("release_year" not in q.columns) or (not q["release_year"].notna().any()):
         try:
             from src.data import _derive_release_year
-            q = _derive_release_year(q.copy())
+            q = _derive_release_year(q.copy(deep=False))
         except Exception:
             pass
 
     if q.empty or "primary_genre" not in q.columns or ("release_year" not in q.columns):
-        st.info("Sem dados suficientes para calcular tendências de gêneros.")
-        return
+        return None, None, None, "Sem dados suficientes para calcular tendências de gêneros."
 
-    q = q[q["release_year"].notna()].copy()
+    q = q[q["release_year"].notna()]
     if q.empty:
-        st.info("Sem anos válidos após filtros para calcular tendências de gêneros.")
-        return
-
-    # Agregar contagem por ano e gênero, depois normalizar por total anual (share)
-    grp = (
-        q.groupby(["release_year", "primary_genre"], observed=True)
-        .size()
-        .reset_index(name="n")
-    )
-    if grp.empty:
-        st.info("Sem combinações de ano e gênero para análise de tendência.")
-        return
+        return None, None, None, "Sem anos válidos após filtros para calcular tendências de gêneros."
 
-    totals = grp.groupby("release_year", as_index=False)["n"].sum().rename(columns={"n": "total"})
-    m = grp.merge(totals, on="release_year", how="left")
-    m["share"] = m["n"].div(m["total"].replace(0, np.nan))
-    m = m.dropna(subset=["share"])  # descarta anos sem total válido
-    if m.empty:
-        st.info("Não foi possível calcular participação por ano.")
-        return
+    # Códigos inteiros do gênero (categórico do carregador ou factorize ordenado)
+    genre = q["primary_genre"]
+    if isinstance(genre.dtype, pd.CategoricalDtype):
+        codes, genres = genre.cat.codes.to_numpy(), genre.cat.categories
+    else:
+        codes, genres = pd.factorize(genre, sort=True)
+    ok = codes >= 0
+    if not ok.any():
+        return None, None, None, "Sem combinações de ano e gênero para análise de tendência."
+    years_u, year_idx = np.unique(q["release_year"].to_numpy(dtype="float64")[ok], return_inverse=True)
+    codes = codes[ok]
 
     # Restringir à janela mais recente de anos
-    years_sorted = sorted(m["release_year"].unique())
-    if len(years_sorted) < 2:
-        st.info("Poucos anos disponíveis para estimar tendência.")
-        return
-    k = min(window_years, len(years_sorted))
-    last_years = years_sorted[-k:]
-    m = m[m["release_year"].isin(last_years)].copy()
-
-    # Pivot para preencher ausências como 0 (sem lançamentos => share 0)
-    pivot = (
-        m.pivot(index="release_year", columns="primary_genre", values="share")
-        .fillna(0.0)
-        .sort_index()
-    )
-    if pivot.shape[0] < 2:
-        st.info("Número insuficiente de anos na janela para estimar tendência.")
-        return
-
-    x = pivot.index.values.astype(float)
+    if len(years_u) < 2:
+        return None, None, None, "Poucos anos disponíveis para estimar tendência."
+    k = min(window_years, len(years_u))
+    in_window = year_idx >= len(years_u) - k
+
+    # Matriz ano x gênero de contagens: histograma 2-D via um único np.bincount sobre o índice achatado
+    # (sem groupby/merge/pivot); ausências ficam 0 (sem lançamentos => share 0) e só entram gêneros presentes
+    n_genres = len(genres)
+    flat = (year_idx[in_window] - (len(years_u) - k)) * n_genres + codes[in_window]
+    counts = np.bincount(flat, minlength=k * n_genres).reshape(k, n_genres)
+    present = np.flatnonzero(counts.sum(axis=0))
+    counts = counts[:, present]
+    Y = counts / counts.sum(axis=1, keepdims=True)  # participação anual (share)
+
+    x = years_u[-k:]
     start_year, end_year = int(x[0]), int(x[-1])
-    start_shares = pivot.iloc[0]
-    end_shares = pivot.iloc[-1]
-
-    slopes = []
-    for genre in pivot.columns:
-        y = pivot[genre].values.astype(float)
-        if np.allclose(y, 0):
-            s = 0.0
-        else:
-            try:
-                s = float(np.polyfit(x, y, 1)[0])  # variação por ano (fração/ano)
-            except Exception:
-                s = 0.0
-        slopes.append({
-            "primary_genre": genre,
-            "slope_ppy": s * 100.0,  # pontos percentuais por ano
-            "start_pct": float(start_shares.get(genre, 0.0) * 100.0),
-            "end_pct": float(end_shares.get(genre, 0.0) * 100.0),
-        })
 
-    df_slopes = pd.DataFrame(slopes)
+    # Slope da regressão linear em forma fechada, para todos os gêneros de uma vez:
+    # cov(x, y) / var(x) (variação por ano, em fração/ano)
+    xm = x - x.mean()
+    slopes = (Y - Y.mean(axis=0)).T @ xm / (xm @ xm)
+
+    df_slopes = pd.DataFrame({
+        "primary_genre": pd.Index(genres)[present].astype(str),
+        "slope_ppy": slopes * 100.0,  # pontos percentuais por ano
+        "start_pct": Y[0] * 100.0,
+        "end_pct": Y[-1] * 100.0,
+    })
     if df_slopes.empty:
-        st.info("Não foi possível estimar tendências com os dados atuais.")
+        return None, None, None, "Não foi possível estimar tendências com os dados atuais."
+    return df_slopes, start_year, end_year, None
+
+
+def trending_genres_board(df: pd.DataFrame, f: dict, top_n: int = 7, window_years: int = 5):
+    """Exibe dois gráficos lado a lado destacando gêneros emergentes e em declínio.
+    A tendência é estimada pelo coeficiente angular (slope) da participação anual (share) do gênero
+    ao longo de uma janela recente de anos.
+
+    - emergentes: maiores slopes positivos (p.p. por ano)
+    - em declínio: menores slopes (negativos)
+    """
+    # Aplicar filtros, mas ignorar pré-seleção de gêneros para não enviesar a tendência
+    df_slopes, start_year, end_year, msg = _trend_slopes(df, _filters_key({**f, "genres": []}), window_years)
+    if df_slopes is None:
+        st.info(msg)
         return
 
-    emerg = df_slopes.sort_values("slope_ppy", ascending=False).head(top_n)
-    decl = df_slopes.sort_values("slope_ppy", ascending=True).head(top_n)
+    # Seleção parcial dos extremos (sem ordenar todos os gêneros)
+    emerg = df_slopes.nlargest(top_n, "slope_ppy")
+    decl = df_slopes.nsmallest(top_n, "slope_ppy")
 
     # Layout lado a lado
     col1, col2 = st.columns(2)
@@ -10,6 +10,11 @@ try:
     import pyarrow.parquet as pq  # para fallback de leitura remota de Parquet
 except Exception:  # pragma: no cover
     pq = None
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc  # kernels vetorizados de string
+except Exception:  # pragma: no cover
+    pa = pc = None
 
 
 DATA_DIR_CANDIDATES = [
@@ -36,16 +41,48 @@ LIST_COLS = [
 
 BOOL_COLS = ["Windows", "Mac", "Linux"]
 
+# Textos aceitos como booleanos em BOOL_COLS (comparados já em minúsculas e sem espaços)
+_BOOL_MAP = {
+    "true": True, "1": True, "yes": True, "y": True, "t": True,
+    "false": False, "0": False, "no": False, "n": False, "f": False,
+}
+
+# Ano YYYY em texto livre (fallback escalar de _extract_year_fallback)
+_YEAR_RE = re.compile(r"(\d{4})")
+
+# Primeiro número (inteiro ou decimal) de 'User score'
+_NUM_RE = re.compile(r"(\d+(?:\.\d+)?)")
+
+# Colunas efetivamente usadas pelo pipeline/gráficos; o Parquet local é lido só com elas
+PARQUET_COLUMNS = {
+    "AppID", "Name", "name", "Year", "year",
+    "Release date", "Release Date", "release_date", "ReleaseDate", "Date", "date",
+    "release_year", "Price", "is_free", "Positive", "Negative", "sentiment_ratio",
+    "User score", "Metacritic score", "Recommendations",
+    "Estimated owners", "owners_min", "owners_max", "owners_mid",
+    "Genres", "genres", "primary_genre", "Publishers", *BOOL_COLS,
+}
+
+# Texto muito repetido: dicionário (category) logo na leitura, antes de dedup/recortes
+CATEGORY_HINTS = {
+    "Publishers": "category",
+    "Developers": "category",
+}
+
+# Inteiros sem sinal no menor tamanho que comporta os valores do Steam (AppID, contagens < 2**32,
+# idade < 256). Nullable (UInt*) porque o CSV tem buracos; valores fora da faixa fazem o astype
+# falhar e a coluna fica como o leitor entregou.
 DTYPE_HINTS = {
-    "AppID": "Int64",
-    "Peak CCU": "Int64",
-    "Required age": "Int64",
+    "AppID": "UInt32",
+    "Peak CCU": "UInt32",
+    "Required age": "UInt8",
     "Price": "float32",
     "Metacritic score": "float32",
     "User score": "float32",
-    "Positive": "Int64",
-    "Negative": "Int64",
-    "Recommendations": "Int64",
+    "Positive": "UInt32",
+    "Negative": "UInt32",
+    "Recommendations": "UInt32",
+    **CATEGORY_HINTS,
 }
 
 
@@ -56,6 +93,196 @@ def _find_first_path(paths):
     return None
 
 
+# Versão do pipeline de preparo: incrementar invalida os caches em data/_cache
+_CACHE_VERSION = 2
+CACHE_DIR = "data/_cache"
+
+
+def _data_source():
+    """Arquivo local usado como fonte (Parquet, ou CSV; games_small.csv tem prioridade), ou None."""
+    parquet_path = _find_first_path(PARQUET_CANDIDATES)
+    csv_path = _find_first_path(DATA_DIR_CANDIDATES)
+    if csv_path is not None and os.path.basename(csv_path).lower().startswith("games_small"):
+        return csv_path
+    return parquet_path or csv_path
+
+
+# Sufixo dos arquivos de cache: _<mtime>_<tamanho>_y<YEARS_BACK>_v<versão>.parquet
+_CACHE_KEY_RE = r"_\d+_\d+_y-?\d+_v\d+\.parquet"
+
+
+def _cache_path(source):
+    """Parquet já preparado para a fonte, chaveado por mtime/tamanho do arquivo, YEARS_BACK e versão do pipeline."""
+    if source is None:
+        return None
+    try:
+        st_ = os.stat(source)
+    except OSError:
+        return None
+    name = os.path.splitext(os.path.basename(source))[0]
+    key = f"{st_.st_mtime:.0f}_{st_.st_size}_y{_years_back()}_v{_CACHE_VERSION}"
+    return os.path.join(CACHE_DIR, f"{name}_{key}.parquet")
+
+
+def _write_parquet(df: pd.DataFrame, path) -> None:
+    """Grava Parquet com ZSTD e row groups de 50 mil linhas (arquivos menores e leitura
+    paralela/filtrável por row group); sem pyarrow, usa o engine padrão do pandas.
+    """
+    if pq is None:
+        df.to_parquet(path, index=False)
+        return
+    df.to_parquet(
+        path, engine="pyarrow", index=False,
+        compression="zstd", compression_level=3,
+        row_group_size=50_000, use_dictionary=True, data_page_size=1 << 20,
+    )
+
+
+def _write_cache(df, dim_genres, cache_path):
+    """Grava o DataFrame final (com dim_genres nos metadados) no cache e remove versões antigas
+    da mesma fonte. Falhas são ignoradas: o cache é só uma otimização.
+    """
+    try:
+        out = df.copy(deep=False)
+        out.attrs = {**df.attrs, "dim_genres": dim_genres.values.tolist()}
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        current = os.path.basename(cache_path)
+        # Nome exato da fonte + chave: games_small_<chave> não é versão antiga de games_<chave>
+        name = re.sub(_CACHE_KEY_RE + "$", "", current)
+        stale = re.compile(re.escape(name) + _CACHE_KEY_RE)
+        for old in os.listdir(CACHE_DIR):
+            if old != current and stale.fullmatch(old):
+                os.remove(os.path.join(CACHE_DIR, old))
+        _write_parquet(out, cache_path)
+    except Exception:
+        pass
+
+
+def _build_dim_genres(df: pd.DataFrame) -> pd.DataFrame:
+    """Dimensão de gêneros (genre, n) para os filtros; aceita 'Genres' ou 'genres'."""
+    genre_col = "Genres" if "Genres" in df.columns else ("genres" if "genres" in df.columns else None)
+    if genre_col is None:
+        return pd.DataFrame({"genre": [], "n": []})
+    if pa is not None:
+        # Arrow: achata as listas em C++ sem explodir o DataFrame inteiro (todas as colunas) como antes
+        try:
+            flat = pc.list_flatten(pa.array(df[genre_col].to_numpy(dtype=object), type=pa.list_(pa.string())))
+            flat = pc.filter(flat, pc.not_equal(flat, ""))  # também descarta nulos
+            vc = pc.value_counts(flat)  # valores na ordem de primeira ocorrência, como a hashtable do pandas
+            counts = pd.Series(
+                vc.field("counts").to_numpy().astype("int64"),
+                index=pd.Index(vc.field("values").to_numpy(zero_copy_only=False), dtype=object).infer_objects(),
+            )
+            # Ordenação estável (empates na ordem de primeira ocorrência), como o value_counts do pandas 3
+            dim_genres = counts.sort_values(ascending=False, kind="stable").reset_index()
+            dim_genres.columns = ["genre", "n"]
+            return dim_genres
+        except Exception:
+            # Linhas que não são listas de texto (ex.: string crua) seguem pelo explode abaixo
+            pass
+    dim_genres = (
+        df.explode(genre_col)[genre_col]
+        .dropna().replace("", np.nan)
+        .dropna().value_counts().reset_index()
+    )
+    # Após reset_index, as colunas ficam ['index', genre_col] ou ['index', <series_name>]
+    # Garante nomes padronizados
+    dim_genres.columns = ["genre", "n"]
+    return dim_genres
+
+
+# Início de todo ponteiro de Git LFS ("version https://git-lfs.github.com/spec/v1")
+_LFS_SIGNATURE = b"version https://git-lfs"
+
+# Falhas do leitor pyarrow que justificam tentar o engine C (CSV fora do que o Arrow suporta)
+_ARROW_CSV_ERRORS = (ValueError, ImportError) + ((pa.ArrowException,) if pa is not None else ())
+
+
+def _is_lfs_pointer(path) -> bool:
+    """True se o arquivo é um ponteiro de Git LFS (a assinatura fica no byte 0)."""
+    try:
+        with open(path, "rb") as fh:
+            return fh.read(len(_LFS_SIGNATURE)) == _LFS_SIGNATURE
+    except OSError:
+        return False
+
+
+def _read_csv(path) -> pd.DataFrame:
+    """Lê o CSV com o engine pyarrow (multithread); só recorre ao engine C quando o Arrow não dá conta."""
+    try:
+        return pd.read_csv(path, engine="pyarrow")
+    except _ARROW_CSV_ERRORS:
+        return pd.read_csv(path)
+
+
+def _years_back():
+    """Janela global de anos (variável de ambiente YEARS_BACK, padrão 10)."""
+    try:
+        return int(os.getenv("YEARS_BACK", "10"))
+    except Exception:
+        return 10
+
+
+def _cleanup_keep_mask(df: pd.DataFrame) -> np.ndarray:
+    """Máscara das linhas que sobrevivem à regra de limpeza (gratuito com Metacritic score == 0 sai)."""
+    keep = np.ones(len(df), dtype=bool)
+    # Regra de limpeza solicitada:
+    # Remover jogos GRATUITOS cuja coluna "Metacritic score" seja exatamente 0.
+    # - Considera-se gratuito quando df["is_free"] é True, ou, na ausência dessa coluna,
+    #   quando Price <= 0 (com NaN tratado como 0).
+    try:
+        if "Metacritic score" in df.columns:
+            # Garante comparação robusta mesmo com strings/NaN
+            meta_series = pd.to_numeric(df["Metacritic score"], errors="coerce")
+            score_zero = meta_series.fillna(-1) == 0
+            # Determina gratuidade
+            if "is_free" in df.columns:
+                free_mask = df["is_free"].fillna(False).astype(bool)
+            elif "Price" in df.columns:
+                free_mask = (pd.to_numeric(df["Price"], errors="coerce").fillna(0) <= 0.0)
+            else:
+                free_mask = pd.Series(False, index=df.index)
+            # Marca para remoção onde ambos são verdadeiros
+            keep &= ~(free_mask & score_zero).to_numpy(dtype=bool)
+    except Exception:
+        # Em caso de qualquer problema, não interrompe o pipeline
+        pass
+    return keep
+
+
+def _read_parquet_pruned(path):
+    """Lê o Parquet (caminho local ou bytes já baixados) apenas com as colunas usadas pelo app e
+    já descarta na leitura os anos fora da janela YEARS_BACK. O ano final da janela vem de uma leitura
+    prévia só de release_year e das colunas da regra de limpeza, como em load_data.
+    A leitura de colunas/row groups usa as threads do pyarrow (use_threads).
+    """
+    def _src():
+        return io.BytesIO(path) if isinstance(path, (bytes, bytearray)) else path
+
+    if pq is None:
+        return pd.read_parquet(_src())
+    pf = pq.ParquetFile(_src())
+    names = pf.schema_arrow.names
+    columns = [c for c in names if c in PARQUET_COLUMNS] or None
+    filters = None
+    years_back = _years_back()
+    # Com janela de 1 ano o recorte deixaria um único ano e dispararia a re-derivação
+    if "release_year" in names and years_back >= 2:
+        # A janela é calculada sobre as linhas que sobrevivem à regra de limpeza; as estatísticas
+        # dos row groups cobrem todas as linhas e poderiam deslocar o ano final
+        try:
+            probe_cols = [c for c in ("release_year", "is_free", "Price", "Metacritic score") if c in names]
+            probe = pd.read_parquet(_src(), engine="pyarrow", columns=probe_cols, use_threads=True)
+            yrs = pd.to_numeric(probe["release_year"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            kept = yrs[_cleanup_keep_mask(probe)]
+            if np.isfinite(kept).any():
+                filters = [("release_year", ">=", int(np.nanmax(kept)) - years_back + 1)]
+        except Exception:
+            # Sem a leitura prévia, lê sem filtro de linhas (load_data recorta depois)
+            filters = None
+    return pd.read_parquet(_src(), engine="pyarrow", columns=columns, filters=filters, use_threads=True)
+
+
 def _parse_list(x):
     """Converte diversos formatos para lista.
     Suporta: "['A','B']" (literal Python) e "A,B" (csv simples).
@@ -77,68 +304,203 @@ def _parse_list(x):
     return [s] if s else []
 
 
+# Literal de lista "simples": só strings entre aspas sem vírgula, aspas, barra invertida ou quebra de linha
+_SIMPLE_LIST_RE = r"""^\[\s*(?:'[^'\\,\n\r]*'|"[^"\\,\n\r]*")(?:\s*,\s*(?:'[^'\\,\n\r]*'|"[^"\\,\n\r]*"))*\s*\]$"""
+
+
+def _parse_list_series(s: pd.Series, with_first: bool = False):
+    """Versão vetorizada de _parse_list para uma coluna inteira (mesmo resultado, linha a linha).
+    Trabalha sobre os valores distintos: literais simples "['A', 'B']" e textos separados por , ; |
+    saem de kernels de string; só o resíduo (literais complexos, tuplas...) passa por _parse_list.
+    Linhas com o mesmo texto compartilham a mesma lista (somente leitura).
+    Com with_first=True devolve também o primeiro item de cada linha (category, 'Unknown' se vazia),
+    calculado sobre os textos distintos e propagado pelos mesmos códigos.
+    """
+    codes, uniques = pd.factorize(s)
+    text = pd.Series(np.asarray(uniques, dtype=object)).astype(str).str.strip()
+    parsed = pd.Series([None] * len(text), dtype=object)
+
+    simple = text.str.match(_SIMPLE_LIST_RE)
+    empty_list = text.str.match(r"^\[\s*\]$")
+    literal = text.str.startswith("[") | text.str.startswith("(")
+    plain = ~literal & (text != "")
+
+    # "['A', 'B']" -> ['A', 'B']: itens sem vírgula, basta separar e remover as aspas
+    items = text[simple].str[1:-1].str.strip().str.split(r"\s*,\s*", regex=True)
+    parsed[simple] = items.map(lambda parts: [p[1:-1] for p in parts])
+    # Texto simples: separador = primeiro entre , ; | presente (como em _parse_list), sem itens vazios
+    remaining = plain.copy()
+    for sep in [",", ";", "|"]:
+        has_sep = remaining & text.str.contains(sep, regex=False)
+        parts = text[has_sep].str.split(rf"\s*{re.escape(sep)}\s*", regex=True)
+        parsed[has_sep] = parts.map(lambda ps: [p for p in ps if p])
+        remaining &= ~has_sep
+    parsed[remaining] = text[remaining].map(lambda v: [v])
+    # Resíduo: literais que não são listas simples
+    residual = literal & ~simple & ~empty_list
+    parsed[residual] = text[residual].map(_parse_list)
+
+    out = np.empty(len(text) + 1, dtype=object)
+    for i, v in enumerate(parsed):
+        out[i] = v if v is not None else []
+    out[-1] = []  # NaN (código -1)
+    lists = pd.Series(out[codes], index=s.index, name=s.name)
+    if not with_first:
+        return lists
+    firsts = np.array([_first_item(v) for v in out], dtype=object)
+    first = pd.Series(firsts[codes], index=s.index, name="primary_genre").infer_objects().astype("category")
+    return lists, first
+
+
+def _first_item(xs):
+    """Primeiro item de uma lista/tupla/array (listas do Parquet voltam como np.ndarray); senão 'Unknown'."""
+    return xs[0] if isinstance(xs, (list, tuple, np.ndarray)) and len(xs) else "Unknown"
+
+
+def _primary_genre(s: pd.Series) -> pd.Series:
+    """Primeiro gênero de cada linha de uma coluna de listas já materializada (ex.: vinda do Parquet),
+    como category. No CSV o gênero primário sai de _parse_list_series(with_first=True).
+    """
+    firsts = [_first_item(xs) for xs in s.to_numpy(dtype=object)]
+    return pd.Series(firsts, index=s.index, name="primary_genre", dtype=object).infer_objects().astype("category")
+
+
+def _first_token(values) -> np.ndarray:
+    """Primeiro item de textos separados por vírgula ("A, B" -> "A"), sem espaços nas bordas.
+    Usa os kernels de string do Arrow (C++) quando disponíveis.
+    """
+    if pc is not None:
+        arr = pa.array(values, type=pa.string())
+        first = pc.utf8_trim_whitespace(pc.list_element(pc.split_pattern(arr, ","), 0))
+        return first.to_numpy(zero_copy_only=False)
+    return (
+        pd.Series(values, dtype="string").str.split(",", n=1).str[0].str.strip()
+        .to_numpy(dtype=object, na_value=None)
+    )
+
+
+def _primary_publisher(publishers: pd.Series) -> pd.Categorical:
+    """Publisher principal (primeiro da lista) como categórico, a partir de 'Publishers' categórico.
+    O recorte roda só sobre as categorias distintas e é propagado às linhas pelos códigos.
+    """
+    first = _first_token(publishers.cat.categories.astype(str))
+    first = np.where(first == "", None, first)
+    tok_codes, tokens = pd.factorize(first)
+    # Código extra -1 no fim: linhas sem publisher (código -1) continuam ausentes
+    row_codes = np.append(tok_codes, -1)[publishers.cat.codes.to_numpy()]
+    return pd.Categorical.from_codes(row_codes, categories=tokens)
+
+
+def _sentiment_ratio(df: pd.DataFrame) -> np.ndarray:
+    """Positive / (Positive + Negative) em float64 (arrays NumPy, sem o caminho ExtensionArray).
+    Colunas ausentes contam como 0; sem avaliações (denom=0) vira NaN.
+    """
+    zeros = np.zeros(len(df))
+    pos = pd.to_numeric(df["Positive"], errors="coerce").to_numpy(dtype="float64", na_value=0.0) if "Positive" in df.columns else zeros
+    neg = pd.to_numeric(df["Negative"], errors="coerce").to_numpy(dtype="float64", na_value=0.0) if "Negative" in df.columns else zeros
+    denom = pos + neg
+    return np.divide(pos, denom, out=np.full(len(df), np.nan), where=denom > 0)
+
+
+def _acceptance_pct(df: pd.DataFrame) -> np.ndarray:
+    """Aceitação (%) em float32: sentiment_ratio * 100 se existir, senão Positive / (Positive + Negative) * 100.
+    Sem avaliações (denom=0) vira NaN.
+    """
+    if "sentiment_ratio" in df.columns:
+        ratio = pd.to_numeric(df["sentiment_ratio"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    else:
+        ratio = _sentiment_ratio(df)
+    return (ratio * 100.0).astype("float32")
+
+
 def _extract_year_fallback(s):
     """Extrai um ano YYYY da string, com sanidade básica."""
     if pd.isna(s):
         return np.nan
-    m = re.search(r"(\d{4})", str(s))
+    m = _YEAR_RE.search(str(s))
     if m:
         y = int(m.group(1))
         return y if 1970 <= y <= 2100 else np.nan
     return np.nan
 
 
-def _parse_owners(s):
-    # "0 - 20000" -> (0, 20000, 10000)
-    if pd.isna(s):
-        return np.nan, np.nan, np.nan
-    try:
-        parts = str(s).replace(",", "").split("-")
-        a = int(parts[0].strip())
-        b = int(parts[1].strip()) if len(parts) > 1 else a
-        return a, b, (a + b) / 2
-    except Exception:
-        return np.nan, np.nan, np.nan
+# "0 - 20000" (após remover vírgulas): primeiro número, segundo opcional; partes extras após outro "-" são ignoradas
+_OWNERS_RE = r"^\s*\+?(\d+)\s*(?:-\s*\+?(\d+)\s*(?:-[\s\S]*)?)?$"
+
+
+def _parse_owners_series(s: pd.Series):
+    """Faixa de owners para a coluna inteira numa única extração por regex.
+    "0 - 20000" -> (0, 20000, 10000); retorna (owners_min, owners_max, owners_mid) e textos fora do padrão viram NaN.
+    """
+    ext = s.astype(str).str.replace(",", "", regex=False).str.extract(_OWNERS_RE)
+    lo = pd.to_numeric(ext[0], errors="coerce")
+    hi = pd.to_numeric(ext[1], errors="coerce").fillna(lo)
+    if lo.dtype.kind == "i":
+        hi = hi.astype(lo.dtype)  # nenhum valor inválido: mantém as colunas inteiras
+    return lo, hi, (lo + hi) / 2
+
+
+def _apply_dtype_hints(df: pd.DataFrame, hints=DTYPE_HINTS) -> None:
+    """Aplica os hints (padrão DTYPE_HINTS) in-place, pulando colunas que o leitor (engine pyarrow) já entregou no dtype certo."""
+    for c, t in hints.items():
+        if c in df.columns and df[c].dtype != t:
+            try:
+                df[c] = df[c].astype(t)
+            except Exception:
+                pass
+
+
+def _normalize_bools(df: pd.DataFrame) -> None:
+    """Normaliza BOOL_COLS in-place para bool NumPy (strings/0/1 -> True/False, ausentes -> False).
+    Colunas que o leitor já tipou como bool dispensam a passada de texto (str/lower/map).
+    Sem o dtype nullable "boolean": após o fillna(False) a máscara seria sempre vazia.
+    """
+    for c in BOOL_COLS:
+        if c not in df.columns:
+            continue
+        if pd.api.types.is_bool_dtype(df[c].dtype):
+            if df[c].dtype != bool:
+                df[c] = df[c].fillna(False).astype(bool)
+            continue
+        try:
+            df[c] = (
+                df[c]
+                .astype(str)
+                .str.strip()
+                .str.lower()
+                .map(_BOOL_MAP)
+                .eq(True)  # ausentes/desconhecidos (NaN no map) => False
+            )
+        except Exception:
+            try:
+                df[c] = df[c].astype("boolean").fillna(False).astype(bool)
+            except Exception:
+                pass
 
 
-def _coerce_user_score(x):
-    """Converte diferentes formatos de 'User score' para um float na escala 0–10.
+def _coerce_user_score_series(s: pd.Series) -> pd.Series:
+    """Converte diferentes formatos de 'User score' para float32 na escala 0–10 (coluna inteira, vetorizado).
     Exemplos suportados:
     - "7.8/10" -> 7.8
     - "76%" -> 7.6
     - "7,8" (vírgula decimal) -> 7.8
     - "0.78" (supõe 0–1) -> 7.8
     - "78" (supõe 0–100) -> 7.8
-    Valores fora do intervalo [0, 10] retornam NaN.
+    Valores ausentes, sem número ou fora do intervalo [0, 10] viram NaN.
     """
-    if pd.isna(x):
-        return np.nan
-    s = str(x).strip()
-    if not s:
-        return np.nan
+    # Regex e heurística rodam uma vez por valor distinto (notas se repetem muito); ausentes => código -1 => NaN
+    codes, uniques = pd.factorize(s)
     # normaliza vírgula decimal
-    s = s.replace(",", ".")
-    # captura primeiro número (inteiro ou decimal)
-    m = re.search(r"(\d+(?:\.\d+)?)", s)
-    if not m:
-        return np.nan
-    try:
-        val = float(m.group(1))
-    except Exception:
-        return np.nan
-    # Se o texto contiver '/10', tratar diretamente como escala 0–10
-    if "/10" in s:
-        pass  # já está em 0–10
-    else:
-        # Ajuste de escala heurístico
-        if 0 <= val <= 1:
-            val = val * 10.0
-        elif 10 < val <= 100:
-            val = val / 10.0
+    t = pd.Series(np.asarray(uniques, dtype=object)).astype(str).str.strip().str.replace(",", ".", regex=False)
+    # primeiro número (inteiro ou decimal)
+    val = pd.to_numeric(t.str.extract(_NUM_RE, expand=False), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    # Com '/10' já está em 0–10; senão, ajuste de escala heurístico (0–1 => x10, 10–100 => /10)
+    per_ten = t.str.contains("/10", regex=False).to_numpy(dtype=bool)
+    val = np.where(per_ten, val, np.where(val <= 1, val * 10.0, np.where((val > 10) & (val <= 100), val / 10.0, val)))
     # sanidade final
-    if not (0 <= val <= 10):
-        return np.nan
-    return val
+    val = np.where((val >= 0) & (val <= 10), val, np.nan).astype("float32")
+    out = np.append(val, np.float32(np.nan))[codes]
+    return pd.Series(out, index=s.index, name=s.name)
 
 
 DATE_CANDIDATES = [
@@ -152,55 +514,174 @@ DATE_CANDIDATES = [
 ]
 
 
+def _map_unique(s: pd.Series, fn) -> pd.Series:
+    """Aplica fn (retorno numérico) uma vez por valor distinto de s e propaga às linhas; ausentes viram NaN."""
+    codes, uniques = pd.factorize(s)
+    out = np.append(np.array([fn(u) for u in uniques], dtype="float64"), np.nan)
+    return pd.Series(out[codes], index=s.index)
+
+
+def _mark_release_year(df: pd.DataFrame) -> pd.DataFrame:
+    """Registra em df.attrs["release_year_ok"] se release_year saiu com ao menos 2 anos distintos:
+    load_data consulta a marca em vez de recontar os anos para decidir se re-deriva.
+    """
+    df.attrs["release_year_ok"] = bool(df["release_year"].dropna().nunique() >= 2)
+    return df
+
+
 def _derive_release_year(df: pd.DataFrame) -> pd.DataFrame:
     """Garante que df['release_year'] exista e represente corretamente o ano de lançamento,
     detectando automaticamente a coluna de data/ano.
-    Também padroniza a coluna 'Release date' quando possível.
+    Também padroniza a coluna 'Release date' quando há datas completas
+    (fontes só com ano não precisam do datetime: o ano vem direto do número).
     """
     # Escolhe a melhor coluna disponível
     col = next((c for c in DATE_CANDIDATES if c in df.columns), None)
     if col is None:
         df["release_year"] = pd.Series(dtype="Int64")
-        return df
+        return _mark_release_year(df)
 
     if col.lower() in ("year",):
         # Coluna com o ano diretamente
-        years = pd.to_numeric(df[col], errors="coerce")
-        df["release_year"] = years.astype("Int64")
-        try:
-            df["Release date"] = pd.to_datetime(years, format="%Y", errors="coerce")
-        except Exception:
-            pass
-        return df
+        df["release_year"] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        return _mark_release_year(df)
 
     # Coluna com data completa (string)
     # Em pandas >= 2.2, usar format="mixed" evita o aviso e lida com formatos mistos.
     raw = df[col].astype(str).str.strip()
+    # Atalho: coluna só com anos de 4 dígitos plausíveis => número direto, sem to_datetime
+    if len(raw) and raw.str.fullmatch(r"\d{4}").all():
+        years = pd.to_numeric(raw, errors="coerce")
+        if years.between(1970, 2100).all():
+            df["release_year"] = years.astype("Int64")
+            return _mark_release_year(df)
+    # Datas se repetem muito: converte só os textos distintos e propaga às linhas pelos códigos
+    codes, uniq = pd.factorize(raw)
     try:
-        dt = pd.to_datetime(raw, errors="coerce", format="mixed", cache=True)
+        udt = pd.to_datetime(uniq, errors="coerce", format="mixed", cache=True)
     except TypeError:
         # Compatibilidade caso a versão do pandas não suporte format="mixed"
-        dt = pd.to_datetime(raw, errors="coerce")
+        udt = pd.to_datetime(uniq, errors="coerce")
+    dt = pd.Series(pd.DatetimeIndex(udt).take(codes, allow_fill=True, fill_value=pd.NaT), index=df.index)
     years = dt.dt.year.astype("float")
     mask = years.isna()
     if mask.any():
-        # 1) Tenta extrair ano da própria coluna selecionada
-        years.loc[mask] = df.loc[mask, col].apply(_extract_year_fallback)
+        # 1) Tenta extrair ano da própria coluna selecionada (uma regex por valor distinto)
+        years.loc[mask] = _map_unique(df.loc[mask, col], _extract_year_fallback)
         # 2) Fallback adicional solicitado: usar 'Name'/'name' quando disponível
         mask2 = years.isna()
         if mask2.any():
             if "Name" in df.columns:
-                years.loc[mask2] = df.loc[mask2, "Name"].apply(_extract_year_fallback)
+                years.loc[mask2] = _map_unique(df.loc[mask2, "Name"], _extract_year_fallback)
                 mask2 = years.isna()
             if mask2.any() and "name" in df.columns:
-                years.loc[mask2] = df.loc[mask2, "name"].apply(_extract_year_fallback)
+                years.loc[mask2] = _map_unique(df.loc[mask2, "name"], _extract_year_fallback)
     df["Release date"] = dt
     df["release_year"] = pd.Series(years, dtype="Int64")
+    return _mark_release_year(df)
+
+
+def _drop_duplicate_ids(df: pd.DataFrame, col: str) -> pd.DataFrame:
+    """Equivale a df.drop_duplicates(subset=[col]) (mantém a primeira ocorrência; ausentes contam
+    como um único valor), mas só recorta o DataFrame quando há de fato repetidos: com ids únicos,
+    o caso comum, evita copiar todas as colunas.
+    """
+    dup = df[col].duplicated().to_numpy()
+    return df[~dup] if dup.any() else df
+
+
+def _process_raw(df: pd.DataFrame) -> pd.DataFrame:
+    """Pipeline de preparo do CSV bruto: tipagem, datas, booleanos, listas, owners,
+    flags, limpeza, métricas derivadas e gênero primário.
+    """
+    # Tipagem básica (pula colunas já tipadas pelo leitor)
+    _apply_dtype_hints(df)
+
+    # Datas (robusto + detecção automática)
+    df = _derive_release_year(df)
+
+    # Booleanos (normaliza strings/0/1 para True/False de forma robusta)
+    _normalize_bools(df)
+
+    # Listas (para as colunas de gênero, guarda também o primeiro item de cada linha)
+    firsts = {}
+    for c in LIST_COLS:
+        if c in ("Genres", "genres") and c in df.columns:
+            df[c], firsts[c] = _parse_list_series(df[c], with_first=True)
+        elif c in df.columns:
+            df[c] = _parse_list_series(df[c])
+
+    # Unificar chave de gêneros para 'Genres'
+    if "Genres" not in df.columns and "genres" in df.columns:
+        df["Genres"] = df["genres"]
+
+    # Donos
+    if "Estimated owners" in df.columns:
+        df["owners_min"], df["owners_max"], df["owners_mid"] = _parse_owners_series(df["Estimated owners"])
+    else:
+        df["owners_min"] = np.nan
+        df["owners_max"] = np.nan
+        df["owners_mid"] = np.nan
+
+    # Flags e qualidade
+    if "Price" in df.columns:
+        df["is_free"] = (df["Price"].fillna(0) <= 0.0).astype(bool)
+    else:
+        df["Price"] = np.nan
+        df["is_free"] = False
+
+    if "AppID" in df.columns:
+        df = _drop_duplicate_ids(df, "AppID")
+    if "Name" in df.columns:
+        df = df.dropna(subset=["Name"])  # mantém NaT em datas
+
+    # Métricas derivadas
+    df["sentiment_ratio"] = _sentiment_ratio(df)
+
+    # Gênero primário (calculado no parse; realinhado após dedup/dropna)
+    first = firsts.get("Genres", firsts.get("genres"))
+    if first is not None:
+        df["primary_genre"] = first.reindex(df.index)
+    else:
+        df["primary_genre"] = "Unknown"
     return df
 
 
+def _save_parquet(df: pd.DataFrame) -> None:
+    """Grava o resultado do pipeline em data/games.parquet para as próximas cargas (falhas são ignoradas)."""
+    target_parquet = PARQUET_CANDIDATES[0]
+    try:
+        os.makedirs(os.path.dirname(target_parquet), exist_ok=True)
+        _write_parquet(df, target_parquet)
+    except Exception:
+        pass
+
+
 @st.cache_data(show_spinner=False, ttl=600)
 def load_data():
+    # Cache em disco do resultado final: se a fonte não mudou, pula todo o pipeline de preparo
+    cache_path = _cache_path(_data_source())
+    if cache_path is not None and os.path.exists(cache_path):
+        try:
+            df = pd.read_parquet(cache_path)
+            dim_rows = df.attrs.pop("dim_genres", None)
+            if "release_year" in df.columns:
+                df.attrs["year_sorted"] = True
+            window = df.attrs.get("years_window")
+            if window:
+                try:
+                    st.caption(f"Exibindo apenas os últimos {window[0]} anos: {window[1]}–{window[2]}.")
+                except Exception:
+                    pass
+            if dim_rows is not None:
+                dim_genres = pd.DataFrame(dim_rows, columns=["genre", "n"])
+                dim_genres["n"] = dim_genres["n"].astype("int64")
+            else:
+                dim_genres = _build_dim_genres(df)
+            return df, dim_genres
+        except Exception:
+            pass
+
     parquet_path = _find_first_path(PARQUET_CANDIDATES)
     csv_path = _find_first_path(DATA_DIR_CANDIDATES)
 
@@ -226,18 +707,14 @@ def load_data():
             raise FileNotFoundError("DATA_URL não configurada")
         lower = url.lower()
         if lower.endswith(".parquet"):
-            # Tenta com pyarrow primeiro
+            # Baixa uma vez e lê só as colunas usadas (mesma poda do Parquet local)
             try:
-                return pd.read_parquet(url, engine="pyarrow")
-            except Exception:
-                # Fallback: baixar via urllib e ler com pyarrow.parquet
-                if pq is None:
-                    # Último recurso: tentar o backend padrão do pandas (pode ainda falhar)
-                    return pd.read_parquet(url)
                 with urllib.request.urlopen(url) as resp:
                     data = resp.read()
-                table = pq.read_table(io.BytesIO(data))
-                return table.to_pandas()
+                return _read_parquet_pruned(data)
+            except Exception:
+                # Fallback: esquemas que o urllib não abre (s3://, gs://...) ficam com o pandas/fsspec
+                return pd.read_parquet(url, engine="pyarrow" if pq is not None else "auto")
         # Assume CSV caso contrário
         try:
             return pd.read_csv(url)
@@ -248,7 +725,8 @@ def load_data():
     if parquet_path is not None:
         # Leitura tolerante a LFS/arquivos corrompidos
         try:
-            df = pd.read_parquet(parquet_path)
+            df = _read_parquet_pruned(parquet_path)
+            _apply_dtype_hints(df, CATEGORY_HINTS)
         except Exception:
             df = None
     else:
@@ -258,195 +736,32 @@ def load_data():
         # Tentar garantir release_year mesmo vindo de Parquet antigo
         df = _derive_release_year(df)
         # Se ainda não temos anos suficientes e existir CSV, reprocessa a partir do CSV
-        if ("release_year" not in df.columns or df["release_year"].dropna().nunique() < 2) and csv_path is not None:
-            try:
-                tmp_df = pd.read_csv(csv_path, engine="pyarrow")
-            except Exception:
-                tmp_df = pd.read_csv(csv_path)
-            # Reaplica todo o pipeline do bloco CSV abaixo de forma resumida
-            for c, t in DTYPE_HINTS.items():
-                if c in tmp_df.columns:
-                    try:
-                        tmp_df[c] = tmp_df[c].astype(t)
-                    except Exception:
-                        pass
-            tmp_df = _derive_release_year(tmp_df)
-            _bool_map = {
-                "true": True, "1": True, "yes": True, "y": True, "t": True,
-                "false": False, "0": False, "no": False, "n": False, "f": False,
-            }
-            for c in BOOL_COLS:
-                if c in tmp_df.columns:
-                    try:
-                        tmp_df[c] = (
-                            tmp_df[c].astype(str).str.strip().str.lower().map(_bool_map)
-                            .astype("boolean").fillna(False)
-                        )
-                    except Exception:
-                        try:
-                            tmp_df[c] = tmp_df[c].astype("boolean").fillna(False)
-                        except Exception:
-                            pass
-            for c in LIST_COLS:
-                if c in tmp_df.columns:
-                    tmp_df[c] = tmp_df[c].apply(_parse_list)
-            if "Genres" not in tmp_df.columns and "genres" in tmp_df.columns:
-                tmp_df["Genres"] = tmp_df["genres"]
-            if "Estimated owners" in tmp_df.columns:
-                owners_cols = list(zip(*tmp_df["Estimated owners"].apply(_parse_owners)))
-                if owners_cols:
-                    tmp_df["owners_min"], tmp_df["owners_max"], tmp_df["owners_mid"] = owners_cols
-            else:
-                tmp_df["owners_min"] = np.nan
-                tmp_df["owners_max"] = np.nan
-                tmp_df["owners_mid"] = np.nan
-            if "Price" in tmp_df.columns:
-                tmp_df["is_free"] = (tmp_df["Price"].fillna(0) <= 0.0)
-            else:
-                tmp_df["Price"] = np.nan
-                tmp_df["is_free"] = False
-            if "AppID" in tmp_df.columns:
-                tmp_df = tmp_df.drop_duplicates(subset=["AppID"])
-            if "Name" in tmp_df.columns:
-                tmp_df = tmp_df.dropna(subset=["Name"])  
-            pos = tmp_df["Positive"].fillna(0) if "Positive" in tmp_df.columns else 0
-            neg = tmp_df["Negative"].fillna(0) if "Negative" in tmp_df.columns else 0
-            denom = pos + neg
-            tmp_df["sentiment_ratio"] = np.where(denom > 0, pos / denom, np.nan)
-            if "Genres" in tmp_df.columns:
-                tmp_df["primary_genre"] = tmp_df["Genres"].apply(lambda xs: xs[0] if isinstance(xs, list) and len(xs) else "Unknown")
-            elif "genres" in tmp_df.columns:
-                tmp_df["primary_genre"] = tmp_df["genres"].apply(lambda xs: xs[0] if isinstance(xs, list) and len(xs) else "Unknown")
-            else:
-                tmp_df["primary_genre"] = "Unknown"
-            # Substitui df e regrava parquet otimizado
-            df = tmp_df
-            target_parquet = PARQUET_CANDIDATES[0]
-            try:
-                os.makedirs(os.path.dirname(target_parquet), exist_ok=True)
-                df.to_parquet(target_parquet, index=False)
-            except Exception:
-                pass
+        if not df.attrs.get("release_year_ok") and csv_path is not None:
+            tmp_df = _read_csv(csv_path)
+            # Reaplica todo o pipeline do bloco CSV e regrava o parquet otimizado
+            df = _process_raw(tmp_df)
+            _save_parquet(df)
     elif csv_path is not None:
-        # Detecta ponteiro de Git LFS em CSV (não contém dados reais)
-        is_lfs_pointer = False
-        try:
-            with open(csv_path, "rb") as fh:
-                head = fh.read(256)
-            try:
-                head_text = head.decode("utf-8", errors="ignore")
-                if "https://git-lfs.github.com/spec/v1" in head_text:
-                    is_lfs_pointer = True
-            except Exception:
-                pass
-        except Exception:
-            pass
-
-        if is_lfs_pointer:
+        # Ponteiro de Git LFS no lugar do CSV não contém dados reais
+        if _is_lfs_pointer(csv_path):
             df = None
         else:
-        # Prefer pyarrow engine if available
             try:
-                df = pd.read_csv(csv_path, engine="pyarrow")
+                df = _read_csv(csv_path)
             except Exception:
-                try:
-                    df = pd.read_csv(csv_path)
-                except Exception:
-                    df = None
+                df = None
 
         if df is not None:
-            # Tipagem básica
-            for c, t in DTYPE_HINTS.items():
-                if c in df.columns:
-                    try:
-                        df[c] = df[c].astype(t)
-                    except Exception:
-                        pass
-
-            # Datas (robusto + detecção automática)
-            df = _derive_release_year(df)
-
-            # Booleanos (normaliza strings/0/1 para True/False de forma robusta)
-            _bool_map = {
-                "true": True, "1": True, "yes": True, "y": True, "t": True,
-                "false": False, "0": False, "no": False, "n": False, "f": False,
-            }
-            for c in BOOL_COLS:
-                if c in df.columns:
-                    try:
-                        df[c] = (
-                            df[c]
-                            .astype(str)
-                            .str.strip()
-                            .str.lower()
-                            .map(_bool_map)
-                            .astype("boolean")
-                            .fillna(False)
-                        )
-                    except Exception:
-                        try:
-                            df[c] = df[c].astype("boolean").fillna(False)
-                        except Exception:
-                            pass
-
-            # Listas
-            for c in LIST_COLS:
-                if c in df.columns:
-                    df[c] = df[c].apply(_parse_list)
-
-            # Unificar chave de gêneros para 'Genres'
-            if "Genres" not in df.columns and "genres" in df.columns:
-                df["Genres"] = df["genres"]
-
-            # Donos
-            if "Estimated owners" in df.columns:
-                owners_cols = list(zip(*df["Estimated owners"].apply(_parse_owners)))
-                if owners_cols:
-                    df["owners_min"], df["owners_max"], df["owners_mid"] = owners_cols
-            else:
-                df["owners_min"] = np.nan
-                df["owners_max"] = np.nan
-                df["owners_mid"] = np.nan
-
-            # Flags e qualidade
-            if "Price" in df.columns:
-                df["is_free"] = (df["Price"].fillna(0) <= 0.0)
-            else:
-                df["Price"] = np.nan
-                df["is_free"] = False
-
-            if "AppID" in df.columns:
-                df = df.drop_duplicates(subset=["AppID"])
-            if "Name" in df.columns:
-                df = df.dropna(subset=["Name"])  # mantém NaT em datas
-
-            # Métricas derivadas
-            pos = df["Positive"].fillna(0) if "Positive" in df.columns else 0
-            neg = df["Negative"].fillna(0) if "Negative" in df.columns else 0
-            denom = pos + neg
-            df["sentiment_ratio"] = np.where(denom > 0, pos / denom, np.nan)
-
-            # Gênero primário
-            if "Genres" in df.columns:
-                df["primary_genre"] = df["Genres"].apply(lambda xs: xs[0] if isinstance(xs, list) and len(xs) else "Unknown")
-            elif "genres" in df.columns:
-                df["primary_genre"] = df["genres"].apply(lambda xs: xs[0] if isinstance(xs, list) and len(xs) else "Unknown")
-            else:
-                df["primary_genre"] = "Unknown"
-
+            df = _process_raw(df)
             # Salva Parquet otimizado se possível
-            target_parquet = PARQUET_CANDIDATES[0]
-            try:
-                os.makedirs(os.path.dirname(target_parquet), exist_ok=True)
-                df.to_parquet(target_parquet, index=False)
-            except Exception:
-                pass
+            _save_parquet(df)
     else:
         # Nem Parquet nem CSV válidos: tenta URL remota
         url = _get_data_url()
         if url:
             try:
                 df = _load_remote(url)
+                _apply_dtype_hints(df, CATEGORY_HINTS)
                 df = _derive_release_year(df)
                 st.caption("Carregado dataset remoto definido em DATA_URL.")
             except Exception:
@@ -464,7 +779,7 @@ def load_data():
 
     # Garantias pós-carga (CSV ou Parquet): sempre tentar derivar do melhor campo
     # - Se houver menos de 2 anos únicos válidos, tente derivar novamente a partir dos candidatos
-    need_rederive = (
+    need_rederive = not df.attrs.get("release_year_ok") and (
         "release_year" not in df.columns
         or df["release_year"].isna().all()
         or df["release_year"].dropna().nunique() < 2
@@ -475,96 +790,111 @@ def load_data():
     # Normalização robusta de 'User score' para escala 0–10
     try:
         if "User score" in df.columns:
-            df.loc[:, "User score"] = df["User score"].apply(_coerce_user_score).astype("float32")
+            # Atribuição por coluna (df[c] = ...): com .loc[:, c] o pandas 3 mantinha o dtype texto original
+            df["User score"] = _coerce_user_score_series(df["User score"])
     except Exception:
         # Não interromper o pipeline em caso de esquemas inesperados
         pass
 
-    # Regra de limpeza solicitada:
-    # Remover jogos GRATUITOS cuja coluna "Metacritic score" seja exatamente 0.
-    # - Considera-se gratuito quando df["is_free"] é True, ou, na ausência dessa coluna,
-    #   quando Price <= 0 (com NaN tratado como 0).
-    try:
-        has_meta = "Metacritic score" in df.columns
-        if has_meta:
-            # Garante comparação robusta mesmo com strings/NaN
-            meta_series = pd.to_numeric(df["Metacritic score"], errors="coerce")
-            score_zero = meta_series.fillna(-1) == 0
-            # Determina gratuidade
-            if "is_free" in df.columns:
-                free_mask = df["is_free"].fillna(False).astype(bool)
-            elif "Price" in df.columns:
-                free_mask = (pd.to_numeric(df["Price"], errors="coerce").fillna(0) <= 0.0)
-            else:
-                free_mask = pd.Series(False, index=df.index)
-            # Aplica filtro: remove onde ambos são verdadeiros
-            to_drop = (free_mask & score_zero)
-            if to_drop.any():
-                df = df[~to_drop]
-    except Exception:
-        # Em caso de qualquer problema, não interrompe o pipeline
-        pass
+    # Linhas mantidas: a regra de limpeza e o recorte de anos compõem uma única máscara,
+    # aplicada com um só recorte (uma cópia das colunas em vez de duas)
+    keep = _cleanup_keep_mask(df)
 
     # --- Recorte global de anos (últimos N anos) para todo o dashboard ---
     # Aplica o corte após garantir release_year e antes de construir dimensões
-    try:
-        YEARS_BACK = int(os.getenv("YEARS_BACK", "10"))
-    except Exception:
-        YEARS_BACK = 10
-    if "release_year" in df.columns and df["release_year"].notna().any() and YEARS_BACK > 0:
+    # (janela calculada sobre as linhas que sobrevivem à regra de limpeza)
+    YEARS_BACK = _years_back()
+    years_window = None
+    if "release_year" in df.columns and YEARS_BACK > 0:
         try:
-            y_max = int(np.nanmax(df["release_year"]))
-            y_min_all = int(np.nanmin(df["release_year"]))
-            cutoff = max(y_min_all, y_max - YEARS_BACK + 1)
-            df = df[df["release_year"].between(cutoff, y_max)]
-            try:
-                # Só funciona dentro do contexto do Streamlit
-                st.caption(f"Exibindo apenas os últimos {YEARS_BACK} anos: {cutoff}–{y_max}.")
-            except Exception:
-                pass
+            yrs = pd.to_numeric(df["release_year"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            kept = yrs[keep]
+            if np.isfinite(kept).any():
+                y_max = int(np.nanmax(kept))
+                y_min_all = int(np.nanmin(kept))
+                cutoff = max(y_min_all, y_max - YEARS_BACK + 1)
+                keep &= (yrs >= cutoff) & (yrs <= y_max)  # NaN fica de fora, como no between
+                years_window = [YEARS_BACK, cutoff, y_max]
         except Exception:
             # Se algo falhar, segue sem recorte para não quebrar o fluxo
             pass
 
+    if not keep.all():
+        df = df[keep]
+    if years_window is not None:
+        df.attrs["years_window"] = years_window
+        try:
+            # Só funciona dentro do contexto do Streamlit
+            st.caption(f"Exibindo apenas os últimos {YEARS_BACK} anos: {cutoff}–{y_max}.")
+        except Exception:
+            pass
+
     # Garantir 'Genres' unificado e 'primary_genre' disponível mesmo no caminho Parquet
     if "Genres" not in df.columns and "genres" in df.columns:
         df["Genres"] = df["genres"]
     if "primary_genre" not in df.columns:
         if "Genres" in df.columns:
-            df["primary_genre"] = df["Genres"].apply(lambda xs: xs[0] if isinstance(xs, list) and len(xs) else "Unknown")
+            df["primary_genre"] = _primary_genre(df["Genres"])
         elif "genres" in df.columns:
-            df["primary_genre"] = df["genres"].apply(lambda xs: xs[0] if isinstance(xs, list) and len(xs) else "Unknown")
+            df["primary_genre"] = _primary_genre(df["genres"])
         else:
             df["primary_genre"] = "Unknown"
 
     # Dimensão de gêneros para filtros
-    # Dimensão de gêneros: aceita 'Genres' ou 'genres'
-    genre_col = "Genres" if "Genres" in df.columns else ("genres" if "genres" in df.columns else None)
-    if genre_col is not None:
-        dim_genres = (
-            df.explode(genre_col)[genre_col]
-            .dropna().replace("", np.nan)
-            .dropna().value_counts().reset_index()
-        )
-        # Após reset_index, as colunas ficam ['index', genre_col] ou ['index', <series_name>]
-        # Garante nomes padronizados
-        dim_genres.columns = ["genre", "n"]
-    else:
-        dim_genres = pd.DataFrame({"genre": [], "n": []})
+    dim_genres = _build_dim_genres(df)
+
+    # Ordena por ano (NaN primeiro): os filtros recortam a janela de anos com searchsorted.
+    # O sort já materializa um DataFrame novo, então a compactação abaixo dispensa o df.copy()
+    if "release_year" in df.columns:
+        df = df.sort_values("release_year", kind="stable", na_position="first", ignore_index=True)
+        df.attrs["year_sorted"] = True
 
     # Compactação de dtypes para reduzir memória (útil no deploy)
-    # Garante que estamos trabalhando em uma cópia real para evitar SettingWithCopyWarning
+    # Obs.: atribuição por coluna (df[c] = ...) para que o novo dtype seja de fato aplicado;
+    # substituir colunas inteiras não escreve em recortes (Copy-on-Write)
     try:
-        df = df.copy()
-        if "primary_genre" in df.columns:
-            df.loc[:, "primary_genre"] = df["primary_genre"].astype("category")
+        # Já categóricas desde a leitura; após dedup/recortes, descarta as categorias sem linhas
+        for c in ("primary_genre", "Publishers", "Developers"):
+            if c in df.columns:
+                df[c] = df[c].astype("category").cat.remove_unused_categories()
         if "Publishers" in df.columns:
-            # Pode ser string; categorias economizam memória
-            df.loc[:, "Publishers"] = df["Publishers"].astype("category")
-        for c in ["Price", "User score"]:
+            # Publisher principal (primeiro da lista) pré-calculado uma única vez para os gráficos
+            df["primary_publisher"] = _primary_publisher(df["Publishers"])
+        for c in BOOL_COLS:
             if c in df.columns:
-                df.loc[:, c] = pd.to_numeric(df[c], errors="coerce").astype("float32")
+                df[c] = df[c].fillna(False).astype(bool)
+        # float32 basta para gráficos/agregações e reduz pela metade os bytes lidos por filtro
+        for c in ["Price", "User score", "Metacritic score", "owners_mid", "Recommendations"]:
+            if c in df.columns and df[c].dtype != "float32":
+                df[c] = pd.to_numeric(df[c], errors="coerce").astype("float32")
+        # Contagens de avaliações: inteiros de 32 bits (nullable) em vez de Int64/float64.
+        # O astype("Int32") estoura em silêncio (2**31 + 5 vira negativo), então só estreita quando
+        # a faixa cabe; senão mantém o dtype atual (UInt32 pelos DTYPE_HINTS no caminho CSV)
+        i32 = np.iinfo("int32")
+        for c in ["Positive", "Negative"]:
+            if c in df.columns:
+                try:
+                    col = pd.to_numeric(df[c], errors="coerce")
+                    vals = col.to_numpy(dtype="float64", na_value=np.nan)
+                    vals = vals[~np.isnan(vals)]
+                    if not len(vals) or (vals.min() >= i32.min and vals.max() <= i32.max):
+                        df[c] = col.astype("Int32")
+                except (TypeError, ValueError, OverflowError):
+                    pass
+        # Faixas de owners (sem nulos): menor inteiro que comporta os valores
+        for c in ["owners_min", "owners_max"]:
+            if c in df.columns and pd.api.types.is_integer_dtype(df[c].dtype):
+                df[c] = pd.to_numeric(df[c], downcast="integer")
+        if "release_year" in df.columns:
+            df["release_year"] = pd.to_numeric(df["release_year"], errors="coerce").astype("Int16")
+        # Aceitação (%) derivada uma única vez: filtros e gráficos apenas leem a coluna
+        df["acceptance_pct"] = _acceptance_pct(df)
     except Exception:
         pass
 
+    # Fonte recalculada no fim: o pipeline pode ter (re)gravado data/games.parquet nesta execução
+    cache_path = _cache_path(_data_source())
+    if cache_path is not None and not df.empty:
+        _write_cache(df, dim_genres, cache_path)
+
     return df, dim_genres
@@ -21,23 +21,83 @@ def _safe_max(series, default=1):
         return default
 
 
-def sidebar_filters(df, dim_genres):
-    st.sidebar.header("Filtros")
+def freeze_filters(value):
+    """Converte recursivamente o retorno de sidebar_filters em estruturas hashable
+    (listas/tuplas -> tuple, dict -> tuple de pares ordenados, escalares NumPy -> Python).
+    Filtros iguais geram sempre a mesma chave, o que permite reaproveitar os caches entre reruns.
+    """
+    if isinstance(value, dict):
+        return tuple((k, freeze_filters(v)) for k, v in sorted(value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(freeze_filters(v) for v in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _frame_token(df: pd.DataFrame):
+    """Identidade barata do DataFrame para chaves de cache (evita hashear o conteúdo inteiro)."""
+    return id(df), df.shape
 
+
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _frame_token})
+def _filter_domain(df, dim_genres):
+    """Domínio dos widgets da barra lateral (anos, preço, plataformas, gêneros), calculado uma vez
+    por DataFrame: cada interação reexecuta o script, mas o df carregado é sempre o mesmo objeto.
+    """
     # Ano de lançamento
     df_years = df
     # Fallback: tentar derivar release_year caso esteja ausente ou todo nulo
     try:
         if ("release_year" not in df_years.columns) or (not df_years["release_year"].notna().any()):
             from src.data import _derive_release_year  # import local para evitar ciclos em tempo de import
-            df_years = _derive_release_year(df_years.copy())
+            df_years = _derive_release_year(df_years.copy(deep=False))
     except Exception:
         pass
 
     if "release_year" in df_years.columns and df_years["release_year"].notna().any():
-        y_min = int(np.nanmin(df_years["release_year"]))
+        year_bounds = (int(np.nanmin(df_years["release_year"])), int(np.nanmax(df_years["release_year"])))
+    else:
+        year_bounds = None
+
+    # Preço
+    p_series = df["Price"] if "Price" in df.columns else pd.Series([], dtype=float)
+    p_min = _safe_min(p_series, 0.0)
+    p_max = _safe_max(p_series, p_min)
+
+    # Plataformas
+    available_platforms = [c for c in ["Windows", "Mac", "Linux"] if c in df.columns]
+
+    # Gêneros (top 30) — robusto a diferentes nomes de coluna e à ausência de dim_genres
+    if not dim_genres.empty:
+        genre_col = "genre" if "genre" in dim_genres.columns else dim_genres.columns[0]
+        genre_list = (
+            dim_genres.head(30)[genre_col].astype(str).tolist()
+        )
+    else:
+        # fallback direto do DF, aceitando 'Genres' ou 'genres'
+        if "Genres" in df.columns:
+            genre_list = (
+                pd.Series(df["Genres"].explode().dropna().unique()).astype(str).tolist()
+            )
+        elif "genres" in df.columns:
+            genre_list = (
+                pd.Series(df["genres"].explode().dropna().unique()).astype(str).tolist()
+            )
+        else:
+            genre_list = []
+
+    return year_bounds, (p_min, p_max), available_platforms, genre_list
+
+
+def sidebar_filters(df, dim_genres):
+    st.sidebar.header("Filtros")
+    year_bounds, (p_min, p_max), available_platforms, genre_list = _filter_domain(df, dim_genres)
+
+    # Ano de lançamento
+    if year_bounds is not None:
+        y_min, ds_y_max = year_bounds
         # Melhorar o máximo: limitar ao ano atual para evitar valores anômalos no dataset
-        ds_y_max = int(np.nanmax(df_years["release_year"]))
         y_max = min(ds_y_max, datetime.now().year)
         if y_min < y_max:
             # Travar aos últimos 10 anos (sem depender de variável de ambiente)
@@ -54,9 +114,6 @@ def sidebar_filters(df, dim_genres):
         years = None
 
     # Preço
-    p_series = df["Price"] if "Price" in df.columns else pd.Series([], dtype=float)
-    p_min = _safe_min(p_series, 0.0)
-    p_max = _safe_max(p_series, p_min)
     if p_min < p_max:
         price = st.sidebar.slider("Preço (USD)", float(p_min), float(p_max), (float(p_min), float(p_max)))
     else:
@@ -64,7 +121,6 @@ def sidebar_filters(df, dim_genres):
         price = (p_min, p_max)
 
     # Plataformas
-    available_platforms = [c for c in ["Windows", "Mac", "Linux"] if c in df.columns]
     platforms = st.sidebar.multiselect(
         "Plataformas",
         available_platforms,
@@ -72,24 +128,7 @@ def sidebar_filters(df, dim_genres):
         help="Selecione uma ou mais. Em branco = todas."
     )
 
-    # Gêneros (top 30) — robusto a diferentes nomes de coluna e à ausência de dim_genres
-    if not dim_genres.empty:
-        genre_col = "genre" if "genre" in dim_genres.columns else dim_genres.columns[0]
-        genre_list = (
-            dim_genres.head(30)[genre_col].astype(str).tolist()
-        )
-    else:
-        # fallback direto do DF, aceitando 'Genres' ou 'genres'
-        if "Genres" in df.columns:
-            genre_list = (
-                pd.Series(df["Genres"].explode().dropna().unique()).astype(str).tolist()
-            )
-        elif "genres" in df.columns:
-            genre_list = (
-                pd.Series(df["genres"].explode().dropna().unique()).astype(str).tolist()
-            )
-        else:
-            genre_list = []
+    # Gêneros (top 30)
     top_genres = st.sidebar.multiselect("Gêneros (top 30)", genre_list)
 
     # Aceitação mínima (com base em Positive/Negative) em porcentagem 0–100